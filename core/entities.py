@@ -1,5 +1,5 @@
 from dataclasses import dataclass
-from typing import Dict
+from typing import Dict, NamedTuple
 import pandas as pd
 
 INDONESIA_OPERATORS = {
@@ -15,8 +15,7 @@ INDONESIA_OPERATORS = {
     "51027": "Bolt",
 }
 
-@dataclass(frozen=True)
-class NetworkIdentifier:
+class NetworkIdentifier(NamedTuple):
     """Value Object untuk Network ID yang sudah dikonversi"""
     mcc: str
     mnc: str
@@ -51,7 +50,7 @@ class NetworkIdentifier:
         )
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class TowerMapping:
     """Entity untuk mapping tower"""
     tower_id: str
@@ -59,7 +58,7 @@ class TowerMapping:
     enodeb_id: int
 
 
-@dataclass
+@dataclass(slots=True)
 class KQIRecord:
     """Entity untuk record KQI"""
     timestamp: str
@@ -70,7 +69,7 @@ class KQIRecord:
     tower_mapping: TowerMapping = None
 
 
-@dataclass
+@dataclass(slots=True)
 class ProcessingResult:
     """Result container untuk processing output"""
     mapped_data: 'pd.DataFrame'
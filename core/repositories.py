@@ -1,5 +1,5 @@
 from abc import ABC, abstractmethod
-from typing import List, Dict
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
 import pandas as pd
 
 class IFileRepository(ABC):
@@ -9,24 +9,24 @@ class IFileRepository(ABC):
     def list_gz_files(self, folder_path: str) -> List[str]:
         pass
 
-    @abstractmethod
-    def extract_gz_files(self, gz_files: List[str], output_folder: str) -> List[str]:
-        pass
 
+class IDataRepository(ABC):
+    """Interface untuk data operations"""
+    # Thread decode/parse per process (None = semua core); dibatasi di worker process
+    threads: Optional[int] = None
+    
     @abstractmethod
-    def create_directory(self, directory_path: str) -> None:
+    def load_csv_files(self, csv_files: List[str], delimiter: str) -> pd.DataFrame:
         pass
 
     @abstractmethod
-    def remove_directory(self, directory_path: str) -> None:
+    def iter_csv_files(self, csv_files: List[str], delimiter: str,
+                       columns: Optional[List[str]] = None) -> Iterator[pd.DataFrame]:
         pass
 
-
-class IDataRepository(ABC):
-    """Interface untuk data operations"""
-    
     @abstractmethod
-    def load_csv_files(self, csv_files: List[str], delimiter: str) -> pd.DataFrame:
+    def iter_csv_batches(self, csv_file: str, delimiter: str,
+                         columns: Optional[List[str]] = None) -> Iterator[pd.DataFrame]:
         pass
 
     @abstractmethod
@@ -40,7 +40,21 @@ class IDataRepository(ABC):
 
 class IKQIProcessor(ABC):
     """Interface untuk KQI processing"""
+    # Kolom raw yang dibaca processor (None = semua kolom)
+    INPUT_COLUMNS: Optional[List[str]] = None
     
     @abstractmethod
     def process(self, kqiraw: pd.DataFrame, sourceraw: pd.DataFrame) -> Dict[str, pd.DataFrame]:
+        pass
+
+    @abstractmethod
+    def process_chunks(self, chunks: Iterable[pd.DataFrame], sourceraw: pd.DataFrame) -> Dict[str, pd.DataFrame]:
+        pass
+
+    @abstractmethod
+    def sum_chunk(self, kqiraw: pd.DataFrame, sourceraw: pd.DataFrame) -> Tuple[pd.DataFrame, pd.DataFrame]:
+        pass
+
+    @abstractmethod
+    def process_sums(self, partial_sums: Iterable[Tuple[pd.DataFrame, pd.DataFrame]]) -> Dict[str, pd.DataFrame]:
         pass
\ No newline at end of file
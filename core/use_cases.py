@@ -1,9 +1,58 @@
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
 from datetime import datetime
+from typing import List, Optional, Tuple
 import pandas as pd
 
 from .repositories import IFileRepository, IDataRepository, IKQIProcessor
 from .entities import ProcessingResult
 
+# State per worker process, di-set sekali oleh _init_worker
+_worker_state = {}
+
+
+@contextmanager
+def _worker_environ(**env: str):
+    """Set env var sementara selama worker process di-start (spawn mewarisi os.environ)"""
+    previous = {name: os.environ.get(name) for name in env}
+    os.environ.update(env)
+    try:
+        yield
+    finally:
+        for name, value in previous.items():
+            if value is None:
+                os.environ.pop(name, None)
+            else:
+                os.environ[name] = value
+
+
+def _init_worker(data_repo: IDataRepository, processor: IKQIProcessor, sourceraw: pd.DataFrame,
+                 threads: int):
+    """Initializer ProcessPoolExecutor: simpan repo, processor, dan mapping di worker"""
+    # Paralelisme sudah antar process; thread decode/parse per worker dibatasi
+    data_repo.threads = threads
+    _worker_state.update(data_repo=data_repo, processor=processor, sourceraw=sourceraw)
+
+
+def _sum_batches(data_repo: IDataRepository, processor: IKQIProcessor, sourceraw: pd.DataFrame,
+                 csv_file: str) -> Tuple[int, List[Tuple[pd.DataFrame, pd.DataFrame]]]:
+    """Baca dan SUM parsial satu file per batch; peak memory satu batch, bukan satu file"""
+    rows = 0
+    partial_sums = []
+    for batch in data_repo.iter_csv_batches(csv_file, delimiter="|", columns=processor.INPUT_COLUMNS):
+        rows += len(batch)
+        partial_sums.append(processor.sum_chunk(batch, sourceraw))
+    return rows, partial_sums
+
+
+def _sum_file(csv_file: str) -> Tuple[int, List[Tuple[pd.DataFrame, pd.DataFrame]]]:
+    """_sum_batches di worker; hanya hasil SUM yang dikirim balik"""
+    return _sum_batches(
+        _worker_state['data_repo'], _worker_state['processor'], _worker_state['sourceraw'], csv_file
+    )
+
 
 class ProcessKQIDataUseCase:
     """Use Case untuk memproses KQI data"""
@@ -12,11 +61,17 @@ class ProcessKQIDataUseCase:
         self, 
         file_repo: IFileRepository,
         data_repo: IDataRepository, 
-        processor: IKQIProcessor
+        processor: IKQIProcessor,
+        max_workers: Optional[int] = None,
+        write_parquet: bool = False
     ):
         self.file_repo = file_repo
         self.data_repo = data_repo
         self.processor = processor
+        # Jumlah worker process (None = os.cpu_count()); 1 = proses di process ini
+        self.max_workers = max_workers or os.cpu_count() or 1
+        # Opsional: simpan juga mapped output sebagai .parquet
+        self.write_parquet = write_parquet
         self.log_callback = None
         self.progress_callback = None
 
@@ -46,51 +101,37 @@ class ProcessKQIDataUseCase:
     ) -> ProcessingResult:
         """Execute complete processing pipeline"""
         
-        total_steps = 10
+        total_steps = 9
         
         self.log("=" * 80)
         self.log("KQI-MAAKMAAY")
         self.log("=" * 80)
 
-        extract_folder = f"{output_folder}/_temp_extracted"
-        
         try:
             # Step 1: List files
             self.update_progress(1, total_steps, "Listing .csv.gz files...")
-            self.log("\n[Step 1/9] Listing .csv.gz files...")
+            self.log("\n[Step 1/8] Listing .csv.gz files...")
             gz_files = self.file_repo.list_gz_files(input_folder)
             self.log(f"Found {len(gz_files)} files")
 
             if not gz_files:
                 raise Exception("No .csv.gz files found!")
 
-            # Step 2: Extract files
-            self.update_progress(2, total_steps, "Extracting files...")
-            self.log("\n[Step 2/9] Extracting .csv.gz files...")
-            self.file_repo.create_directory(extract_folder)
-            csv_files = self.file_repo.extract_gz_files(gz_files, extract_folder)
-            self.log(f"Extracted {len(csv_files)} files")
-
-            # Step 3: Load and merge CSV files
-            self.update_progress(3, total_steps, "Loading CSV files...")
-            self.log("\n[Step 3/9] Loading CSV files (NO HEADER)...")
-            kqiraw = self.data_repo.load_csv_files(csv_files, delimiter="|")
-            self.log(f"Total records loaded: {len(kqiraw):,}")
-
-            # Step 4: Load mapping file
-            self.update_progress(4, total_steps, "Loading mapping file...")
-            self.log("\n[Step 4/9] Loading mapping file (WITH HEADER)...")
+            # Step 2: Load mapping file
+            self.update_progress(2, total_steps, "Loading mapping file...")
+            self.log("\n[Step 2/8] Loading mapping file (WITH HEADER)...")
             sourceraw = self.data_repo.load_mapping_file(mapping_file)
             self.log(f"Mapping records loaded: {len(sourceraw):,}")
 
-            # Step 5-9: Process data
-            self.update_progress(5, total_steps, "Processing data...")
-            self.log("\n[Step 5-9/9] Processing data...")
+            # Step 3-7: Stream .csv.gz per file (decompress, parse, SUM parsial)
+            self.update_progress(3, total_steps, "Loading & processing CSV files...")
+            self.log("\n[Step 3-7/8] Loading & processing .csv.gz files (NO HEADER)...")
             self.log("  → AGG")
             self.log("  → SUM")
             self.log("  → SAVING OUTPUTS")
-            
-            results = self.processor.process(kqiraw, sourceraw)
+
+            results, records_loaded = self._process_files(gz_files, sourceraw)
+            self.log(f"Total records loaded: {records_loaded:,}")
             
             result_mapped = results.get("mapped", pd.DataFrame())
             result_unmapped = results.get("unmapped", pd.DataFrame())
@@ -99,22 +140,29 @@ class ProcessKQIDataUseCase:
             self.log(f"Unmapped records: {len(result_unmapped):,}")
 
             # Save outputs
-            self.update_progress(9, total_steps, "Saving outputs...")
+            self.update_progress(8, total_steps, "Saving outputs...")
             self.log("\n[Final] Saving outputs...")
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
 
             mapped_file = f"{output_folder}/KQI_{timestamp}.csv"
+            mapped_parquet_file = f"{output_folder}/KQI_{timestamp}.parquet"
             unmapped_file = f"{output_folder}/kqi_unmapped_{timestamp}.csv"
 
             if not result_mapped.empty:
                 self.data_repo.save_output(result_mapped, mapped_file)
                 self.log(f"✓ Mapped data saved: {mapped_file}")
+                if self.write_parquet:
+                    try:
+                        self.data_repo.save_output(result_mapped, mapped_parquet_file)
+                        self.log(f"✓ Mapped data saved: {mapped_parquet_file}")
+                    except ImportError:
+                        self.log("  (Parquet engine not installed, skipping .parquet output)")
 
             if not result_unmapped.empty:
                 self.data_repo.save_output(result_unmapped, unmapped_file)
                 self.log(f"✓ Unmapped data saved: {unmapped_file}")
 
-            self.update_progress(10, total_steps, "Cleaning up...")
+            self.update_progress(9, total_steps, "Finishing...")
             self.log("\n" + "=" * 80)
             self.log("PROCESSING COMPLETE!")
             self.log("=" * 80)
@@ -129,15 +177,39 @@ class ProcessKQIDataUseCase:
         except Exception as e:
             self.log(f"❌ Error during processing: {str(e)}")
             raise
-        finally:
-            # Always cleanup extracted files
-            self._cleanup_extracted_files(extract_folder)
 
-    def _cleanup_extracted_files(self, extract_folder: str):
-        """Cleanup extracted files after processing"""
-        try:
-            self.log("\n[Cleanup] Removing temporary files...")
-            self.file_repo.remove_directory(extract_folder)
-            self.log(f"✓ Temporary folder removed: {extract_folder}")
-        except Exception as e:
-            self.log(f"⚠️  Warning: Could not remove temporary files: {str(e)}")
\ No newline at end of file
+    def _process_files(self, gz_files: List[str], sourceraw: pd.DataFrame):
+        """SUM parsial per file (paralel antar process bila max_workers > 1), lalu finalize"""
+        records_loaded = 0
+
+        def track_sums(file_sums):
+            nonlocal records_loaded
+            for index, (rows, partial_sums) in enumerate(file_sums, start=1):
+                records_loaded += rows
+                self.log(f"  [{index}/{len(gz_files)}] {rows:,} records")
+                yield from partial_sums
+
+        workers = min(self.max_workers, len(gz_files))
+        if workers <= 1:
+            # Juga dipakai untuk satu file besar: tetap streaming per batch
+            file_sums = (
+                _sum_batches(self.data_repo, self.processor, sourceraw, csv_file)
+                for csv_file in gz_files
+            )
+            results = self.processor.process_sums(track_sums(file_sums))
+        else:
+            # spawn: fork dari process yang sudah punya thread (GUI, Arrow pool) tidak aman
+            threads = max(1, (os.cpu_count() or 1) // workers)
+            with ProcessPoolExecutor(
+                max_workers=workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker,
+                initargs=(self.data_repo, self.processor, sourceraw, threads)
+            ) as executor:
+                # Thread pool Polars dibuat saat import di worker, sebelum _init_worker
+                # jalan; semua worker di-start oleh submit di dalam map()
+                with _worker_environ(POLARS_MAX_THREADS=str(threads)):
+                    file_sums = executor.map(_sum_file, gz_files)
+                results = self.processor.process_sums(track_sums(file_sums))
+
+        return results, records_loaded
\ No newline at end of file
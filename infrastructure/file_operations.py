@@ -1,49 +1,142 @@
 import gzip
 import os
-import shutil
+import queue
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from itertools import islice
 from pathlib import Path
-from typing import List
+from typing import Iterable, Iterator, List, Optional, Tuple
 import pandas as pd
 import numpy as np
 
 from core.repositories import IFileRepository, IDataRepository, IKQIProcessor
-from core.entities import NetworkIdentifier
+from core.entities import INDONESIA_OPERATORS
 
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pa_csv
+except ImportError:  # pyarrow opsional, fallback ke pandas.read_csv
+    pa = None
+    pa_csv = None
 
-class FileRepository(IFileRepository):
-    """Concrete implementation of file operations"""
-    
-    def list_gz_files(self, folder_path: str) -> List[str]:
-        """List semua file .csv.gz dalam folder"""
-        path = Path(folder_path)
-        return sorted([str(f) for f in path.glob("*.csv.gz")])
+try:
+    import pyarrow.parquet as pa_parquet
+except ImportError:  # output .parquet fallback ke DataFrame.to_parquet
+    pa_parquet = None
 
-    def extract_gz_files(self, gz_files: List[str], output_folder: str) -> List[str]:
-        """Extract file .csv.gz ke folder output"""
-        extracted_files = []
+try:
+    import polars as pl
+except ImportError:  # polars opsional, dipakai oleh PolarsKQIProcessor
+    pl = None
 
-        for gz_file in gz_files:
-            output_file = os.path.join(output_folder, Path(gz_file).stem)
+try:
+    from isal.igzip import open as gzip_open
+except ImportError:  # python-isal opsional, fallback ke gzip stdlib
+    gzip_open = gzip.open
 
-            with gzip.open(gz_file, "rb") as f_in:
-                with open(output_file, "wb") as f_out:
-                    shutil.copyfileobj(f_in, f_out)
+try:
+    import rapidgzip
+except ImportError:  # rapidgzip opsional, dekompresi paralel untuk .gz besar
+    rapidgzip = None
 
-            extracted_files.append(output_file)
+# Buffer read file mentah: 1 MiB per syscall, bukan 8 KiB default
+READ_BUFFER_SIZE = 1 << 20
+# .gz di atas ukuran ini didekompresi multithread (rapidgzip); di bawahnya
+# biaya start thread pool rapidgzip lebih besar dari gain-nya
+PARALLEL_GZIP_MIN_SIZE = 16 << 20
+# Jumlah rows per batch untuk fallback pandas di iter_csv_batches
+PANDAS_BATCH_ROWS = 1_000_000
 
-        return extracted_files
 
-    def create_directory(self, directory_path: str) -> None:
-        """Create directory if not exists"""
-        Path(directory_path).mkdir(parents=True, exist_ok=True)
+def _prefetch(iterable: Iterable, maxsize: int = 4) -> Iterator:
+    """Iterate iterable di thread producer; maks maxsize item di-buffer di depan consumer"""
+    buffer = queue.Queue(maxsize=maxsize)
+    stop = threading.Event()
 
-    def remove_directory(self, directory_path: str) -> None:
-        """Remove directory and all its contents"""
+    def produce():
         try:
-            if os.path.exists(directory_path):
-                shutil.rmtree(directory_path)
+            for item in iterable:
+                buffer.put((True, item))
+                if stop.is_set():
+                    return
+            buffer.put((False, None))
         except Exception as e:
-            raise Exception(f"Failed to remove directory {directory_path}: {str(e)}")
+            buffer.put((False, e))
+
+    producer = threading.Thread(target=produce, daemon=True)
+    producer.start()
+    try:
+        while True:
+            has_item, item = buffer.get()
+            if not has_item:
+                if item is not None:
+                    raise item
+                return
+            yield item
+    finally:
+        # Consumer selesai / berhenti lebih awal: lepaskan put() yang sedang blocking
+        stop.set()
+        while producer.is_alive():
+            try:
+                buffer.get(timeout=0.1)
+            except queue.Empty:
+                pass
+
+
+# Lookup ASCII -> nilai nibble hex, -1 untuk karakter non-hex
+HEX_NIBBLE_LUT = np.full(256, -1, dtype=np.int8)
+HEX_NIBBLE_LUT[ord('0'):ord('9') + 1] = np.arange(10)
+HEX_NIBBLE_LUT[ord('A'):ord('F') + 1] = np.arange(10, 16)
+HEX_NIBBLE_LUT[ord('a'):ord('f') + 1] = np.arange(10, 16)
+
+# Operator code (int8) per PLMN 5 digit. Code urut alfabetis nama operator,
+# sehingga groupby/sort pada code sama urutannya dengan pada string.
+OPERATOR_NAMES = np.array(sorted(set(INDONESIA_OPERATORS.values()) | {"Unknown"}), dtype=object)
+UNKNOWN_OPERATOR_CODE = int(np.flatnonzero(OPERATOR_NAMES == "Unknown")[0])
+OPERATOR_CODE_TABLE = np.full(100000, UNKNOWN_OPERATOR_CODE, dtype=np.int8)
+for _plmn, _operator in INDONESIA_OPERATORS.items():
+    OPERATOR_CODE_TABLE[int(_plmn)] = np.flatnonzero(OPERATOR_NAMES == _operator)[0]
+
+
+def decode_hex_columns(chars: np.ndarray) -> np.ndarray:
+    """Decode matrix karakter hex (N, width) uint8 ke int64 via shift/OR"""
+    nibbles = HEX_NIBBLE_LUT[chars]
+    if (nibbles < 0).any():
+        raise ValueError("Invalid hex digit in cgisai")
+    nibbles = nibbles.astype(np.int64)
+    result = np.zeros(len(chars), dtype=np.int64)
+    for i in range(chars.shape[1]):
+        result = (result << 4) | nibbles[:, i]
+    return result
+
+
+def decode_operator_codes(chars: np.ndarray) -> np.ndarray:
+    """Lookup operator code dari matrix karakter PLMN (N, 5) uint8"""
+    digits = chars.astype(np.int64) - ord('0')
+    is_numeric = ((digits >= 0) & (digits <= 9)).all(axis=1)
+    plmn = np.zeros(len(chars), dtype=np.int64)
+    for i in range(chars.shape[1]):
+        plmn = plmn * 10 + digits[:, i]
+    codes = OPERATOR_CODE_TABLE[np.where(is_numeric, plmn, 0)]
+    return np.where(is_numeric, codes, UNKNOWN_OPERATOR_CODE).astype(np.int8)
+
+
+class FileRepository(IFileRepository):
+    """Concrete implementation of file operations"""
+    
+    def list_gz_files(self, folder_path: str) -> List[str]:
+        """List semua file .csv.gz dalam folder"""
+        # normcase: case-insensitive di Windows, sama seperti Path.glob.
+        # File hidden (mis. '._x.csv.gz' AppleDouble dari macOS) bukan data KQI.
+        with os.scandir(folder_path) as entries:
+            return sorted(
+                entry.path for entry in entries
+                if not entry.name.startswith(".")
+                and os.path.normcase(entry.name).endswith(".csv.gz")
+                and entry.is_file()
+            )
 
 
 class DataRepository(IDataRepository):
@@ -74,36 +167,232 @@ class DataRepository(IDataRepository):
         22: 'tcp_rtt_step1_good_count'
     }
     
+    # Kolom yang harus tetap string (hex), sisanya di-infer oleh parser
+    STRING_COLUMNS = ['cgisai']
+    # Reverse COLUMN_MAPPING (nama kolom -> posisi), dihitung sekali
+    COLUMN_POSITIONS = {name: i for i, name in COLUMN_MAPPING.items()}
+    _threads: Optional[int] = None
+
+    @property
+    def threads(self) -> Optional[int]:
+        """Batas thread decode/parse (None = semua core)"""
+        return self._threads
+
+    @threads.setter
+    def threads(self, threads: Optional[int]) -> None:
+        self._threads = threads
+        if threads is not None and pa is not None:
+            # Thread pool Arrow global per process, ikut dibatasi
+            pa.set_cpu_count(threads)
+
     def load_csv_files(self, csv_files: List[str], delimiter: str) -> pd.DataFrame:
-        """Load dan gabungkan multiple CSV files - NO HEADER"""
-        dfs = []
-        for csv_file in csv_files:
-            df = pd.read_csv(csv_file, delimiter=delimiter, header=None)
-            df['source_file'] = Path(csv_file).name
-            dfs.append(df)
-        
-        combined_df = pd.concat(dfs, ignore_index=True)
-        col_map = {i: name for i, name in self.COLUMN_MAPPING.items() if i < len(combined_df.columns)}
-        combined_df = combined_df.rename(columns=col_map)
-        
-        return combined_df
+        """Load dan gabungkan multiple CSV / .csv.gz files - NO HEADER
+
+        File .gz di-parse langsung dari stream dekompresi (tanpa extract ke disk),
+        paralel antar file.
+        """
+        reader = self._read_csv_arrow if pa_csv is not None else self._read_csv_pandas
+        with ThreadPoolExecutor(max_workers=os.cpu_count()) as executor:
+            parts = list(executor.map(
+                lambda f: self._with_source_file(reader(f, delimiter), f), csv_files
+            ))
+
+        if pa_csv is not None:
+            combined = pa.concat_tables(parts, promote_options='permissive')
+            return combined.to_pandas(split_blocks=True, self_destruct=True)
+
+        return pd.concat(parts, ignore_index=True)
+
+    def iter_csv_files(self, csv_files: List[str], delimiter: str,
+                       columns: Optional[List[str]] = None) -> Iterator[pd.DataFrame]:
+        """Yield satu DataFrame per CSV / .csv.gz file - NO HEADER
+
+        File dibaca paralel dengan read-ahead terbatas (maks os.cpu_count() file
+        sekaligus), sehingga peak memory tidak bergantung pada jumlah file.
+        Bila columns diisi, hanya kolom tersebut yang di-parse.
+        """
+        max_workers = os.cpu_count() or 1
+        files = iter(csv_files)
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            pending = deque(
+                executor.submit(self._read_csv_frame, csv_file, delimiter, columns)
+                for csv_file in islice(files, max_workers)
+            )
+            while pending:
+                df = pending.popleft().result()
+                for csv_file in islice(files, 1):
+                    pending.append(executor.submit(self._read_csv_frame, csv_file, delimiter, columns))
+                yield df
+
+    def iter_csv_batches(self, csv_file: str, delimiter: str,
+                         columns: Optional[List[str]] = None) -> Iterator[pd.DataFrame]:
+        """Yield satu file CSV / .csv.gz per batch - NO HEADER
+
+        Dekompresi + parsing jalan di thread producer (queue maks 4 batch),
+        overlap dengan pemrosesan batch sebelumnya oleh consumer.
+        """
+        if pa_csv is not None:
+            batches = self._iter_batches_arrow(csv_file, delimiter, columns)
+        else:
+            batches = self._iter_batches_pandas(csv_file, delimiter, columns)
+        return _prefetch(batches, maxsize=4)
+
+    def _iter_batches_arrow(self, csv_file: str, delimiter: str,
+                            columns: Optional[List[str]]) -> Iterator[pd.DataFrame]:
+        """Streaming read via pyarrow.csv.open_csv, satu DataFrame per RecordBatch"""
+        # open_csv meng-infer tipe dari block pertama saja dan tidak bisa berubah lagi,
+        # jadi tipe semua kolom di-pin (string / float64) lalu di-downcast per batch
+        options = self._arrow_csv_options(delimiter, columns, pin_types=True)
+        with self._open_source(csv_file) as fh:
+            reader = pa_csv.open_csv(fh, *options)
+            for batch in reader:
+                table = self._downcast_integral(pa.Table.from_batches([batch]))
+                table = self._label_arrow_table(table)
+                yield table.to_pandas(split_blocks=True, self_destruct=True,
+                                      use_threads=self.threads != 1)
+
+    def _downcast_integral(self, table: "pa.Table") -> "pa.Table":
+        """Kolom float64 tanpa null dan tanpa pecahan -> int64, seperti inferensi read_csv"""
+        for i, field in enumerate(table.schema):
+            column = table.column(i)
+            if field.type != pa.float64() or column.null_count:
+                continue
+            try:
+                table = table.set_column(i, field.name, column.cast(pa.int64()))
+            except pa.ArrowInvalid:
+                pass  # ada nilai pecahan: tetap float64
+        return table
+
+    def _iter_batches_pandas(self, csv_file: str, delimiter: str,
+                             columns: Optional[List[str]]) -> Iterator[pd.DataFrame]:
+        """Streaming read via pandas.read_csv(chunksize=PANDAS_BATCH_ROWS)"""
+        with self._open_source(csv_file) as fh:
+            reader = pd.read_csv(fh, delimiter=delimiter, header=None,
+                                 usecols=self._column_indices(columns),
+                                 chunksize=PANDAS_BATCH_ROWS)
+            for df in reader:
+                yield self._label_pandas_frame(df)
+
+    def _read_csv_frame(self, csv_file: str, delimiter: str,
+                        columns: Optional[List[str]] = None) -> pd.DataFrame:
+        """Read satu file ke DataFrame (PyArrow bila tersedia)"""
+        if pa_csv is not None:
+            table = self._read_csv_arrow(csv_file, delimiter, columns)
+            return table.to_pandas(split_blocks=True, self_destruct=True)
+        return self._read_csv_pandas(csv_file, delimiter, columns)
+
+    def _column_indices(self, columns: Optional[List[str]]) -> Optional[List[int]]:
+        """Posisi kolom (lihat COLUMN_MAPPING) untuk nama kolom yang diminta"""
+        if columns is None:
+            return None
+        positions = self.COLUMN_POSITIONS
+        unknown = [col for col in columns if col not in positions]
+        if unknown:
+            raise ValueError(f"Unknown raw columns: {unknown}")
+        return sorted(positions[col] for col in columns)
+
+    @contextmanager
+    def _open_source(self, csv_file: str):
+        """Open file mentah (buffer besar); .gz didekompresi secara streaming"""
+        if (rapidgzip is not None and csv_file.endswith('.gz')
+                and os.path.getsize(csv_file) > PARALLEL_GZIP_MIN_SIZE):
+            parallelization = self.threads or os.cpu_count() or 1
+            with rapidgzip.open(csv_file, parallelization=parallelization) as fh:
+                yield fh
+            return
+
+        with open(csv_file, 'rb', buffering=READ_BUFFER_SIZE) as raw:
+            if csv_file.endswith('.gz'):
+                with gzip_open(raw, 'rb') as fh:
+                    yield fh
+            else:
+                yield raw
+
+    def _source_name(self, csv_file: str) -> str:
+        """Nama file CSV asal (tanpa suffix .gz)"""
+        path = Path(csv_file)
+        return path.stem if path.suffix == '.gz' else path.name
+
+    def _read_csv_pandas(self, csv_file: str, delimiter: str,
+                         columns: Optional[List[str]] = None) -> pd.DataFrame:
+        """Read satu file via pandas.read_csv"""
+        with self._open_source(csv_file) as fh:
+            df = pd.read_csv(fh, delimiter=delimiter, header=None,
+                             usecols=self._column_indices(columns))
+        return self._label_pandas_frame(df)
+
+    def _label_pandas_frame(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Nama kolom dari COLUMN_MAPPING"""
+        return df.set_axis([self.COLUMN_MAPPING.get(i, i) for i in df.columns], axis=1)
+
+    def _read_csv_arrow(self, csv_file: str, delimiter: str,
+                        columns: Optional[List[str]] = None) -> "pa.Table":
+        """Read satu file via PyArrow (multithreaded)"""
+        with self._open_source(csv_file) as fh:
+            table = pa_csv.read_csv(fh, *self._arrow_csv_options(delimiter, columns))
+        return self._label_arrow_table(table)
+
+    def _arrow_csv_options(self, delimiter: str, columns: Optional[List[str]],
+                           pin_types: bool = False) -> tuple:
+        """(ReadOptions, ParseOptions, ConvertOptions) untuk raw KQI CSV
+
+        pin_types: semua kolom diberi tipe tetap (STRING_COLUMNS string, sisanya
+        float64), tanpa inferensi; wajib untuk streaming reader.
+        """
+        indices = self._column_indices(columns)
+        read_options = pa_csv.ReadOptions(autogenerate_column_names=True, block_size=64 << 20,
+                                          use_threads=self.threads != 1)
+        parse_options = pa_csv.ParseOptions(delimiter=delimiter)
+        column_types = {
+            f"f{i}": pa.string()
+            for i, name in self.COLUMN_MAPPING.items()
+            if name in self.STRING_COLUMNS
+        }
+        if pin_types:
+            for i in (indices if indices is not None else self.COLUMN_MAPPING):
+                column_types.setdefault(f"f{i}", pa.float64())
+        convert_options = pa_csv.ConvertOptions(
+            column_types=column_types,
+            include_columns=[f"f{i}" for i in indices] if indices is not None else None
+        )
+        return read_options, parse_options, convert_options
+
+    def _label_arrow_table(self, table: "pa.Table") -> "pa.Table":
+        """Nama kolom dari COLUMN_MAPPING"""
+        # Nama autogenerate f0, f1, ... -> posisi kolom asli
+        return table.rename_columns([
+            self.COLUMN_MAPPING.get(int(name[1:]), name) for name in table.column_names
+        ])
+
+    def _with_source_file(self, part, csv_file: str):
+        """Tambah kolom source_file (hanya load_csv_files; jalur streaming tidak memakainya)"""
+        name = self._source_name(csv_file)
+        if pa is not None and isinstance(part, pa.Table):
+            source_file = pa.DictionaryArray.from_arrays(
+                pa.array(np.zeros(part.num_rows, dtype=np.int32)), pa.array([name])
+            )
+            return part.append_column('source_file', source_file)
+        part['source_file'] = name
+        return part
 
     def load_mapping_file(self, mapping_file: str) -> pd.DataFrame:
         """Load mapping file - WITH HEADER, COMMA-separated"""
+        required_cols = ['TOWER ID', 'SWE_L5', 'eNodeBId']
+        read_options = dict(sep=',', header=0, encoding='utf-8', skipinitialspace=True)
+        # C engine, hanya parse kolom yang dipakai (nama header di-strip dulu);
+        # type inference tetap sama seperti sebelumnya (mis. TOWER ID '1001.0')
         df = pd.read_csv(
-            mapping_file, 
-            sep=',', 
-            header=0,
-            engine='python',
-            encoding='utf-8',
-            skipinitialspace=True
+            mapping_file,
+            usecols=lambda col: col.strip() in required_cols,
+            **read_options
         )
 
         df.columns = df.columns.str.strip()
-        required_cols = ['TOWER ID', 'SWE_L5', 'eNodeBId']
         missing_cols = [col for col in required_cols if col not in df.columns]
         if missing_cols:
-            available_cols = list(df.columns)
+            # df hanya berisi kolom required; baca header lengkap untuk pesan error
+            header = pd.read_csv(mapping_file, nrows=0, **read_options)
+            available_cols = list(header.columns.str.strip())
             raise ValueError(
                 f"Mapping file missing required columns: {missing_cols}\n"
                 f"Available columns: {available_cols}\n"
@@ -128,298 +417,350 @@ class DataRepository(IDataRepository):
         return df
 
     def save_output(self, df: pd.DataFrame, output_file: str) -> None:
-        """Save output ke CSV"""
+        """Save output ke CSV, atau Parquet (Snappy) bila output_file berakhiran .parquet"""
+        if output_file.endswith(".parquet"):
+            if pa_parquet is not None:
+                table = pa.Table.from_pandas(df, preserve_index=False)
+                pa_parquet.write_table(table, output_file, compression='snappy', use_dictionary=True)
+            else:
+                df.to_parquet(output_file, index=False, compression='snappy')
+            return
+
+        # Output sudah ter-agregasi (kecil); to_csv menjaga format float (mis. 119.0)
         df.to_csv(output_file, index=False)
 
 
 class KQIProcessor(IKQIProcessor):
     """Concrete implementation of KQI processing"""
+    SUM_COLUMNS = [
+        'tcp_rtt',
+        'tcp_rtt_good_count',
+        'tcp_rtt_step1',
+        'tcp_rtt_step1_good_count',
+        'server_probe_ul_lost_pkt',
+        'tcp_ul_packages_withpl',
+        'server_probe_dw_lost_pkt',
+        'tcp_dl_packages_withpl',
+        'user_probe_ul_lost_pkt',
+        'user_probe_dw_lost_pkt'
+    ]
+    INPUT_COLUMNS = ['timecolumn', 'cgisai'] + SUM_COLUMNS
+    # SUM parsial yang ditampung sebelum di-fold menjadi satu SUM berjalan
+    COMBINE_EVERY = 32
+    GROUPBY_MAPPED = ['operator', 'Date', 'tower_id', 'swe_l5']
+    GROUPBY_UNMAPPED = ['operator', 'Date', 'enodeb_id', 'plmn']
+    # (kolom internal, nama kolom output) untuk metrics, urut sesuai file output
+    METRIC_OUTPUT_COLUMNS = [
+        ('E2E Delay(ms)', 'E2E Delay(ms)'),
+        ('tcp_rtt', 'TCP Connect Delay(ms)'),
+        ('tcp_rtt_good_count', 'TCP Connect RTT Count(times)'),
+        ('SYN-SYN ACK Delay(ms)', 'SYN-SYN ACK Delay(ms)'),
+        ('tcp_rtt_step1', 'TCP Connect Step1 Delay(ms)'),
+        ('tcp_rtt_step1_good_count', 'TCP Connect RTT Step1 Count(times)'),
+        ('SYN ACK-ACK Delay(ms)', 'SYN ACK-ACK Delay(ms)'),
+        ('Server Side Uplink TCP Packet Loss Rate(%)', 'Server Side Uplink TCP Packet Loss Rate(%)'),
+        ('server_probe_ul_lost_pkt', 'Server Side Uplink TCP Packet Losses(Packets)'),
+        ('tcp_ul_packages_withpl', 'TCP Uplink Packets (with Payload)(Packets)'),
+        ('Server Side Downlink TCP Packet Loss Rate(%)', 'Server Side Downlink TCP Packet Loss Rate(%)'),
+        ('server_probe_dw_lost_pkt', 'Server Side Downlink TCP Packet Losses'),
+        ('tcp_dl_packages_withpl', 'TCP Downlink Packets (with Payload)(Packets)'),
+        ('Client Side Uplink TCP Packet Loss Rate(%)', 'Client Side Uplink TCP Packet Loss Rate(%)'),
+        ('user_probe_ul_lost_pkt', 'Client Side Uplink TCP Packet Losses(Packets)'),
+        ('Client Side Downlink TCP Packet Loss Rate(%)', 'Client Side Downlink TCP Packet Loss Rate(%)'),
+        ('user_probe_dw_lost_pkt', 'Client Side Downlink TCP Packet Losses(Packets)')
+    ]
     
     def process(self, kqiraw: pd.DataFrame, sourceraw: pd.DataFrame) -> dict:
         """Main processing pipeline"""
+        return self.process_chunks([kqiraw], sourceraw)
+    
+    def process_chunks(self, chunks: Iterable[pd.DataFrame], sourceraw: pd.DataFrame) -> dict:
+        """Streaming pipeline: SUM parsial per chunk, metrics dihitung sekali di akhir"""
+        return self.process_sums(self.sum_chunk(chunk, sourceraw) for chunk in chunks)
+    
+    def process_sums(self, partial_sums: Iterable[Tuple[pd.DataFrame, pd.DataFrame]]) -> dict:
+        """Gabungkan SUM parsial (hasil sum_chunk) dan hitung metrics output"""
+        # Fold bertahap: memory sebanding jumlah group, bukan jumlah chunk
+        mapped_parts = []
+        unmapped_parts = []
+        for mapped_sum, unmapped_sum in partial_sums:
+            mapped_parts.append(mapped_sum)
+            unmapped_parts.append(unmapped_sum)
+            if len(mapped_parts) >= self.COMBINE_EVERY:
+                mapped_parts = [self._combine_sums(mapped_parts, self.GROUPBY_MAPPED)]
+                unmapped_parts = [self._combine_sums(unmapped_parts, self.GROUPBY_UNMAPPED)]
+        
+        mapped_sum = self._combine_sums(mapped_parts, self.GROUPBY_MAPPED)
+        unmapped_sum = self._combine_sums(unmapped_parts, self.GROUPBY_UNMAPPED)
+        result_mapped = self._finalize_daily(mapped_sum) if not mapped_sum.empty else pd.DataFrame()
+        result_unmapped = self._finalize_unmapped(unmapped_sum) if not unmapped_sum.empty else pd.DataFrame()
+        
+        return {"mapped": result_mapped, "unmapped": result_unmapped}
+    
+    def sum_chunk(self, kqiraw: pd.DataFrame, sourceraw: pd.DataFrame) -> Tuple[pd.DataFrame, pd.DataFrame]:
+        """Convert, mapping tower, dan SUM parsial untuk satu chunk (MAPPED, UNMAPPED)"""
         kqiraw = self._convert_network_id(kqiraw)
         kqiraw = self._convert_time_column(kqiraw)
         kqiraw = self._map_tower_data(kqiraw, sourceraw)
-        mapped_data = kqiraw[kqiraw['tower_id'].notna()].copy()
-        unmapped_data = kqiraw[kqiraw['tower_id'].isna()].copy()
-        result_mapped = self._aggregate_daily(mapped_data)
-        result_unmapped = self._aggregate_unmapped(unmapped_data)
+        mapped = kqiraw['tower_id'].notna().to_numpy()
         
-        return {"mapped": result_mapped, "unmapped": result_unmapped}
+        return self._aggregate_daily(kqiraw.loc[mapped]), self._aggregate_unmapped(kqiraw.loc[~mapped])
     
-    def _convert_network_id(self, df: pd.DataFrame) -> pd.DataFrame:
-        """Convert cgisai ke MCC, MNC, eNodeB ID, Cell ID, dan Operator"""
-        network_ids = df['cgisai'].apply(NetworkIdentifier.from_cgisai)
-        
-        df['mcc'] = network_ids.apply(lambda x: x.mcc)
-        df['mnc'] = network_ids.apply(lambda x: x.mnc)
-        df['plmn'] = network_ids.apply(lambda x: x.plmn)
-        df['enodeb_id'] = network_ids.apply(lambda x: x.enodeb_id)
-        df['cell_id'] = network_ids.apply(lambda x: x.cell_id)
-        df['operator'] = network_ids.apply(lambda x: x.operator)
+    def _combine_sums(self, parts: List[pd.DataFrame], groupby_cols: List[str]) -> pd.DataFrame:
+        """Gabungkan SUM parsial dari semua chunk"""
+        parts = [part for part in parts if not part.empty]
+        if not parts:
+            return pd.DataFrame()
+        if len(parts) == 1:
+            return parts[0]
         
+        combined = pd.concat(parts, ignore_index=True)
+        agg_dict = {col: 'sum' for col in self.SUM_COLUMNS}
+        return combined.groupby(groupby_cols, dropna=False, observed=True).agg(agg_dict).reset_index()
+    
+    def _convert_network_id(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Convert cgisai ke PLMN, eNodeB ID, dan Operator (vectorized)"""
+        # Sama dengan NetworkIdentifier.from_cgisai, tapi hanya untuk cgisai unik;
+        # hasil disebar kembali ke setiap baris via codes dari factorize.
+        codes, uniques = pd.factorize(df['cgisai'], use_na_sentinel=False)
+        cgisai = pd.Series(uniques).astype(str).str.zfill(12).str.slice(0, 12)
+
+        # Decode hex langsung dari byte buffer fixed-width 12 karakter
+        raw = ''.join(cgisai.to_numpy()).encode('ascii')
+        chars = np.frombuffer(raw, dtype=np.uint8).reshape(-1, 12)
+
+        # plmn langsung jadi categorical (dictionary = PLMN unik, urut), dipakai ulang groupby
+        plmn_codes, plmn_uniques = pd.factorize(cgisai.str.slice(0, 5), sort=True)
+        df['plmn'] = pd.Categorical.from_codes(plmn_codes[codes], categories=plmn_uniques)
+        df['enodeb_id'] = decode_hex_columns(chars[:, 5:10])[codes]
+        # Cell ID tidak dipakai downstream; hex-nya tetap divalidasi seperti from_cgisai
+        if (HEX_NIBBLE_LUT[chars[:, 10:12]] < 0).any():
+            raise ValueError("Invalid hex digit in cgisai")
+        # Operator disimpan sebagai int8 code, nama dibentuk saat finalize
+        df['operator'] = decode_operator_codes(chars[:, 0:5])[codes]
+
         return df
     
     def _convert_time_column(self, df: pd.DataFrame) -> pd.DataFrame:
-        """Convert timecolumn ke Date dan Time"""
-        # Handle scientific notation (2.0251E+11)
-        df['timecolumn'] = df['timecolumn'].apply(lambda x: f"{int(float(x)):012d}")
-        df['datetime'] = pd.to_datetime(df['timecolumn'], format='%Y%m%d%H%M')
-        df['Date'] = df['datetime'].dt.strftime('%m/%d/%Y')
-        df['Time'] = df['datetime'].dt.strftime('%H:%M')
+        """Validasi timecolumn (YYYYMMDDHHMM) dan bentuk Date key int YYYYMMDD"""
+        # Timestamp unik paling banyak ~1440 per hari, jadi parse sekali per nilai unik
+        codes, uniques = pd.factorize(df['timecolumn'], use_na_sentinel=False)
+        value = self._timestamp_values(uniques)
+        # Date tetap int (categorical) sampai output, string dibentuk di _format_date
+        date_codes, date_uniques = pd.factorize((value // 10**4).astype('int32'), sort=True)
+        df['Date'] = pd.Categorical.from_codes(date_codes[codes], categories=date_uniques)
         return df
+
+    def _timestamp_values(self, uniques) -> pd.Series:
+        """timecolumn unik ke int64 YYYYMMDDHHMM; ValueError bila ada timestamp invalid"""
+        # Handle scientific notation (2.0251E+11)
+        value = pd.to_numeric(pd.Series(uniques)).astype('int64')
+        # Validasi saja (mis. jam 25 / menit 99 -> error), hasilnya tidak disimpan
+        pd.to_datetime(value.astype(str).str.zfill(12), format='%Y%m%d%H%M')
+        return value
+
+    def _format_date(self, date_key: pd.Series) -> pd.Series:
+        """Format Date key int YYYYMMDD ke string MM/DD/YYYY"""
+        # Hanya beberapa tanggal unik per run: format sekali per tanggal, sebar via codes
+        codes, uniques = pd.factorize(date_key)
+        formatted = pd.to_datetime(pd.Series(uniques).astype(str), format='%Y%m%d').dt.strftime('%m/%d/%Y')
+        return pd.Series(formatted.to_numpy()[codes], index=date_key.index)
     
     def _map_tower_data(self, df: pd.DataFrame, sourceraw: pd.DataFrame) -> pd.DataFrame:
         """Mapping eNodeB ID ke tower data"""
-        df = df.merge(
-            sourceraw,
-            on='enodeb_id',
-            how='left'
-        )
+        enodeb_index, tower_columns = self._tower_lookup(sourceraw)
+        # Posisi tower per baris (-1 = tidak ada di mapping), tower_id/swe_l5 sebagai
+        # categorical sehingga tidak ada array string per baris
+        position = enodeb_index.get_indexer(df['enodeb_id'].to_numpy())
+        for col, (col_codes, col_uniques) in tower_columns.items():
+            df[col] = pd.Categorical.from_codes(col_codes[position], categories=col_uniques)
         return df
+
+    def _tower_lookup(self, sourceraw: pd.DataFrame):
+        """Lookup tower dari mapping, dibangun sekali per sourceraw (bukan per chunk)"""
+        cached = getattr(self, '_tower_cache', None)
+        if cached is None or cached[0] is not sourceraw:
+            self._tower_cache = (sourceraw, self._build_tower_lookup(sourceraw))
+        return self._tower_cache[1]
+
+    def _build_tower_lookup(self, sourceraw: pd.DataFrame):
+        """(Index eNodeB ID, {kolom: (codes, categories)}) untuk _map_tower_data"""
+        # Invariant: satu eNodeB -> satu tower (baris pertama di mapping file)
+        towers = sourceraw.drop_duplicates('enodeb_id')
+        tower_columns = {}
+        for col in ('tower_id', 'swe_l5'):
+            col_codes, col_uniques = pd.factorize(towers[col], sort=True)
+            # Sentinel -1 di akhir: position -1 ikut terbaca sebagai code -1 (NaN)
+            tower_columns[col] = (np.append(col_codes, -1), col_uniques)
+        return pd.Index(towers['enodeb_id']), tower_columns
+
+    def __getstate__(self):
+        """Cache lookup tower tidak ikut di-pickle ke worker process"""
+        state = self.__dict__.copy()
+        state.pop('_tower_cache', None)
+        return state
+    
+    def _prepare_groupby(self, df: pd.DataFrame, groupby_cols: List[str],
+                         category_cols: List[str], sum_cols: List[str]) -> pd.DataFrame:
+        """Frame groupby dari kolom yang dipakai saja: category-kan group key
+        low-cardinality dan downcast kolom integer, tanpa menulis ke df input"""
+        columns = {}
+        for col in groupby_cols + sum_cols:
+            column = df[col]
+            if col in category_cols:
+                column = column.astype('category')
+            elif col in sum_cols and pd.api.types.is_integer_dtype(column):
+                column = pd.to_numeric(column, downcast='integer')
+            columns[col] = column
+        return pd.DataFrame(columns, copy=False)
+    
+    def _calculate_metrics(self, result: pd.DataFrame) -> pd.DataFrame:
+        """Hitung delay, packet loss rate, dan NATIONAL dalam satu pass NumPy"""
+        def ratio(numerator: str, denominator: str, scale: float = 1.0) -> np.ndarray:
+            num = result[numerator].to_numpy(dtype=np.float64)
+            den = result[denominator].to_numpy(dtype=np.float64)
+            return np.divide(num, den, out=np.zeros_like(num), where=den > 0) * scale
+
+        e2e = ratio('tcp_rtt', 'tcp_rtt_good_count')
+        syn = ratio('tcp_rtt_step1', 'tcp_rtt_step1_good_count')
+        # NATIONAL dibentuk sekali per operator unik, lalu disebar via codes
+        operator_codes, operators = pd.factorize(result['operator'].astype(str))
+        national = np.where(operators != 'Unknown', 'Indonesia-' + operators, 'Unknown')
+
+        metrics = pd.DataFrame({
+            'E2E Delay(ms)': np.rint(e2e).astype(np.int64),
+            'SYN-SYN ACK Delay(ms)': np.rint(syn).astype(np.int64),
+            'SYN ACK-ACK Delay(ms)': np.rint(e2e - syn).astype(np.int64),
+            'Server Side Downlink TCP Packet Loss Rate(%)': np.round(
+                ratio('server_probe_dw_lost_pkt', 'tcp_dl_packages_withpl', 100), 2),
+            'Server Side Uplink TCP Packet Loss Rate(%)': np.round(
+                ratio('server_probe_ul_lost_pkt', 'tcp_ul_packages_withpl', 100), 2),
+            'Client Side Downlink TCP Packet Loss Rate(%)': np.round(
+                ratio('user_probe_dw_lost_pkt', 'tcp_dl_packages_withpl', 100), 2),
+            'Client Side Uplink TCP Packet Loss Rate(%)': np.round(
+                ratio('user_probe_ul_lost_pkt', 'tcp_ul_packages_withpl', 100), 2),
+            'NATIONAL': national[operator_codes],
+        }, index=result.index)
+
+        return pd.concat([result, metrics], axis=1)
     
     def _aggregate_daily(self, df: pd.DataFrame) -> pd.DataFrame:
-        """Agregasi data per hari per operator per tower (MAPPED)"""
+        """SUM per hari per operator per tower (MAPPED)"""
         if df.empty:
             return pd.DataFrame()
         
-        # STEP 1: SUM by eNodeB first
-        groupby_enodeb = ['operator', 'Date', 'enodeb_id']
-        
-        agg_dict_enodeb = {
-            'tcp_rtt': 'sum',
-            'tcp_rtt_good_count': 'sum',
-            'tcp_rtt_step1': 'sum',
-            'tcp_rtt_step1_good_count': 'sum',
-            'server_probe_ul_lost_pkt': 'sum',
-            'server_probe_dw_lost_pkt': 'sum',
-            'user_probe_ul_lost_pkt': 'sum',
-            'user_probe_dw_lost_pkt': 'sum',
-            'tcp_ul_packages_withpl': 'sum',
-            'tcp_dl_packages_withpl': 'sum',
-            'tower_id': 'first',
-            'swe_l5': 'first'
-        }
-        
-        df_enodeb = df.groupby(groupby_enodeb, dropna=False).agg(agg_dict_enodeb).reset_index()
-        
-        # STEP 2: SUM by tower
-        groupby_tower = ['operator', 'Date', 'tower_id', 'swe_l5']
-        
-        agg_dict_tower = {
-            'tcp_rtt': 'sum',
-            'tcp_rtt_good_count': 'sum',
-            'tcp_rtt_step1': 'sum',
-            'tcp_rtt_step1_good_count': 'sum',
-            'server_probe_ul_lost_pkt': 'sum',
-            'tcp_ul_packages_withpl': 'sum',
-            'server_probe_dw_lost_pkt': 'sum',
-            'tcp_dl_packages_withpl': 'sum',
-            'user_probe_ul_lost_pkt': 'sum',
-            'user_probe_dw_lost_pkt': 'sum'
-        }
-        
-        result = df_enodeb.groupby(groupby_tower, dropna=False).agg(agg_dict_tower).reset_index()
-        
-        # STEP 3: Calculate metrics
-        result['E2E Delay(ms)'] = np.where(
-            result['tcp_rtt_good_count'] > 0,
-            result['tcp_rtt'] / result['tcp_rtt_good_count'],
-            0
-        )
-        
-        result['SYN-SYN ACK Delay(ms)'] = np.where(
-            result['tcp_rtt_step1_good_count'] > 0,
-            result['tcp_rtt_step1'] / result['tcp_rtt_step1_good_count'],
-            0
-        )
-        
-        result['SYN ACK-ACK Delay(ms)'] = result['E2E Delay(ms)'] - result['SYN-SYN ACK Delay(ms)']
-        
-        result['Server Side Downlink TCP Packet Loss Rate(%)'] = np.where(
-            result['tcp_dl_packages_withpl'] > 0,
-            result['server_probe_dw_lost_pkt'] / result['tcp_dl_packages_withpl'] * 100,
-            0
-        )
-        
-        result['Server Side Uplink TCP Packet Loss Rate(%)'] = np.where(
-            result['tcp_ul_packages_withpl'] > 0,
-            result['server_probe_ul_lost_pkt'] / result['tcp_ul_packages_withpl'] * 100,
-            0
-        )
-        
-        result['Client Side Downlink TCP Packet Loss Rate(%)'] = np.where(
-            result['tcp_dl_packages_withpl'] > 0,
-            result['user_probe_dw_lost_pkt'] / result['tcp_dl_packages_withpl'] * 100,
-            0
-        )
-        
-        result['Client Side Uplink TCP Packet Loss Rate(%)'] = np.where(
-            result['tcp_ul_packages_withpl'] > 0,
-            result['user_probe_ul_lost_pkt'] / result['tcp_ul_packages_withpl'] * 100,
-            0
-        )
-        
-        result['NATIONAL'] = result['operator'].apply(
-            lambda x: f'Indonesia-{x}' if x != 'Unknown' else 'Unknown'
-        )
-        
-        result = result.rename(columns={
-            'operator': 'Opr',
-            'swe_l5': 'SWE_L5',
-            'tower_id': 'SWE_L6',
-            'tcp_rtt': 'TCP Connect Delay(ms)',
-            'tcp_rtt_good_count': 'TCP Connect RTT Count(times)',
-            'tcp_rtt_step1': 'TCP Connect Step1 Delay(ms)',
-            'tcp_rtt_step1_good_count': 'TCP Connect RTT Step1 Count(times)',
-            'server_probe_ul_lost_pkt': 'Server Side Uplink TCP Packet Losses(Packets)',
-            'tcp_ul_packages_withpl': 'TCP Uplink Packets (with Payload)(Packets)',
-            'server_probe_dw_lost_pkt': 'Server Side Downlink TCP Packet Losses',
-            'tcp_dl_packages_withpl': 'TCP Downlink Packets (with Payload)(Packets)',
-            'user_probe_ul_lost_pkt': 'Client Side Uplink TCP Packet Losses(Packets)',
-            'user_probe_dw_lost_pkt': 'Client Side Downlink TCP Packet Losses(Packets)'
-        })
-        
-        output_cols = [
-            'Opr', 'Date', 'NATIONAL', 'SWE_L5', 'SWE_L6',
-            'E2E Delay(ms)',
-            'TCP Connect Delay(ms)',
-            'TCP Connect RTT Count(times)',
-            'SYN-SYN ACK Delay(ms)',
-            'TCP Connect Step1 Delay(ms)',
-            'TCP Connect RTT Step1 Count(times)',
-            'SYN ACK-ACK Delay(ms)',
-            'Server Side Uplink TCP Packet Loss Rate(%)',
-            'Server Side Uplink TCP Packet Losses(Packets)',
-            'TCP Uplink Packets (with Payload)(Packets)',
-            'Server Side Downlink TCP Packet Loss Rate(%)',
-            'Server Side Downlink TCP Packet Losses',
-            'TCP Downlink Packets (with Payload)(Packets)',
-            'Client Side Uplink TCP Packet Loss Rate(%)',
-            'Client Side Uplink TCP Packet Losses(Packets)',
-            'Client Side Downlink TCP Packet Loss Rate(%)',
-            'Client Side Downlink TCP Packet Losses(Packets)'
-        ]
-        
-        result['E2E Delay(ms)'] = result['E2E Delay(ms)'].round(0).astype(int)
-        result['SYN-SYN ACK Delay(ms)'] = result['SYN-SYN ACK Delay(ms)'].round(0).astype(int)
-        result['SYN ACK-ACK Delay(ms)'] = result['SYN ACK-ACK Delay(ms)'].round(0).astype(int)
+        # SUM langsung per tower. Karena setiap eNodeB hanya map ke satu tower
+        # (lihat _map_tower_data), hasilnya sama dengan SUM per eNodeB lalu per tower.
+        df = self._prepare_groupby(df, self.GROUPBY_MAPPED, ['Date', 'tower_id', 'swe_l5'], self.SUM_COLUMNS)
         
-        loss_rate_cols = [col for col in output_cols if '(%)' in col]
-        for col in loss_rate_cols:
-            if col in result.columns:
-                result[col] = result[col].round(2)
-        
-        return result[output_cols]
+        agg_dict = {col: 'sum' for col in self.SUM_COLUMNS}
+        return df.groupby(self.GROUPBY_MAPPED, dropna=False, observed=True).agg(agg_dict).reset_index()
+    
+    def _finalize_daily(self, result: pd.DataFrame) -> pd.DataFrame:
+        """Hitung metrics dan susun kolom output dari SUM per tower (MAPPED)"""
+        result['operator'] = OPERATOR_NAMES[result['operator'].to_numpy()]
+        result = self._calculate_metrics(result)
+        
+        result['Date'] = self._format_date(result['Date'])
+        
+        columns = [
+            ('operator', 'Opr'),
+            ('Date', 'Date'),
+            ('NATIONAL', 'NATIONAL'),
+            ('swe_l5', 'SWE_L5'),
+            ('tower_id', 'SWE_L6'),
+        ] + self.METRIC_OUTPUT_COLUMNS
+        
+        result = result[[source for source, _ in columns]]
+        return result.set_axis([name for _, name in columns], axis=1)
     
     def _aggregate_unmapped(self, df: pd.DataFrame) -> pd.DataFrame:
-        """Agregasi data per hari per operator per eNodeB (UNMAPPED)"""
+        """SUM per hari per operator per eNodeB (UNMAPPED)"""
         if df.empty:
             return pd.DataFrame()
         
-        groupby_cols = ['operator', 'Date', 'enodeb_id', 'plmn']
-        
-        agg_dict = {
-            'tcp_rtt': 'sum',
-            'tcp_rtt_good_count': 'sum',
-            'tcp_rtt_step1': 'sum',
-            'tcp_rtt_step1_good_count': 'sum',
-            'server_probe_ul_lost_pkt': 'sum',
-            'tcp_ul_packages_withpl': 'sum',
-            'server_probe_dw_lost_pkt': 'sum',
-            'tcp_dl_packages_withpl': 'sum',
-            'user_probe_ul_lost_pkt': 'sum',
-            'user_probe_dw_lost_pkt': 'sum'
-        }
-        
-        result = df.groupby(groupby_cols, dropna=False).agg(agg_dict).reset_index()
-        
-        result['E2E Delay(ms)'] = np.where(
-            result['tcp_rtt_good_count'] > 0,
-            result['tcp_rtt'] / result['tcp_rtt_good_count'],
-            0
-        )
-        
-        result['SYN-SYN ACK Delay(ms)'] = np.where(
-            result['tcp_rtt_step1_good_count'] > 0,
-            result['tcp_rtt_step1'] / result['tcp_rtt_step1_good_count'],
-            0
-        )
-        
-        result['SYN ACK-ACK Delay(ms)'] = result['E2E Delay(ms)'] - result['SYN-SYN ACK Delay(ms)']
-        
-        result['Server Side Downlink TCP Packet Loss Rate(%)'] = np.where(
-            result['tcp_dl_packages_withpl'] > 0,
-            result['server_probe_dw_lost_pkt'] / result['tcp_dl_packages_withpl'] * 100,
-            0
-        )
-        
-        result['Server Side Uplink TCP Packet Loss Rate(%)'] = np.where(
-            result['tcp_ul_packages_withpl'] > 0,
-            result['server_probe_ul_lost_pkt'] / result['tcp_ul_packages_withpl'] * 100,
-            0
-        )
+        df = self._prepare_groupby(df, self.GROUPBY_UNMAPPED, ['Date', 'plmn'], self.SUM_COLUMNS)
         
-        result['Client Side Downlink TCP Packet Loss Rate(%)'] = np.where(
-            result['tcp_dl_packages_withpl'] > 0,
-            result['user_probe_dw_lost_pkt'] / result['tcp_dl_packages_withpl'] * 100,
-            0
-        )
-        
-        result['Client Side Uplink TCP Packet Loss Rate(%)'] = np.where(
-            result['tcp_ul_packages_withpl'] > 0,
-            result['user_probe_ul_lost_pkt'] / result['tcp_ul_packages_withpl'] * 100,
-            0
+        agg_dict = {col: 'sum' for col in self.SUM_COLUMNS}
+        return df.groupby(self.GROUPBY_UNMAPPED, dropna=False, observed=True).agg(agg_dict).reset_index()
+    
+    def _finalize_unmapped(self, result: pd.DataFrame) -> pd.DataFrame:
+        """Hitung metrics dan susun kolom output dari SUM per eNodeB (UNMAPPED)"""
+        result['operator'] = OPERATOR_NAMES[result['operator'].to_numpy()]
+        result = self._calculate_metrics(result)
+        
+        result['Date'] = self._format_date(result['Date'])
+        
+        columns = [
+            ('operator', 'Opr'),
+            ('Date', 'Date'),
+            ('NATIONAL', 'NATIONAL'),
+            ('plmn', 'PLMN'),
+            ('enodeb_id', 'eNodeBID'),
+        ] + self.METRIC_OUTPUT_COLUMNS
+        
+        result = result[[source for source, _ in columns]]
+        return result.set_axis([name for _, name in columns], axis=1)
+
+
+class PolarsKQIProcessor(KQIProcessor):
+    """KQI processing di Polars lazy engine (multithreaded), output sama dengan KQIProcessor"""
+
+    @staticmethod
+    def is_available() -> bool:
+        """Polars >= 1.0 (dan PyArrow untuk konversi pandas) terinstall"""
+        # replace_strict baru ada di polars 1.0; versi lama fallback ke KQIProcessor
+        return pl is not None and pa is not None and hasattr(pl.Expr, 'replace_strict')
+
+    def sum_chunk(self, kqiraw: pd.DataFrame, sourceraw: pd.DataFrame) -> Tuple[pd.DataFrame, pd.DataFrame]:
+        """Convert ID, join tower, dan SUM parsial satu chunk di Polars"""
+        cgisai = pl.col('cgisai').cast(pl.Utf8).str.zfill(12).str.slice(0, 12)
+        time_value = pl.col('timecolumn').cast(pl.Float64).cast(pl.Int64)
+        # Validasi timestamp sama dengan path pandas, sekali per nilai unik
+        self._timestamp_values(kqiraw['timecolumn'].unique())
+
+        towers = self._tower_lookup(sourceraw).lazy()
+
+        kqi = (
+            pl.from_pandas(kqiraw[['timecolumn', 'cgisai'] + self.SUM_COLUMNS], rechunk=False)
+            .lazy()
+            .with_columns(cgisai.alias('cgisai'))
+            .with_columns(
+                pl.col('cgisai').str.slice(0, 5).alias('plmn'),
+                pl.col('cgisai').str.slice(5, 5).str.to_integer(base=16).alias('enodeb_id'),
+                (time_value // 10**4).cast(pl.Int32).alias('Date'),
+            )
+            .with_columns(
+                pl.col('plmn')
+                .replace_strict(
+                    {plmn: int(OPERATOR_CODE_TABLE[int(plmn)]) for plmn in INDONESIA_OPERATORS},
+                    default=UNKNOWN_OPERATOR_CODE,
+                    return_dtype=pl.Int8
+                )
+                .alias('operator')
+            )
+            .join(towers, on='enodeb_id', how='left')
         )
-        
-        result['NATIONAL'] = result['operator'].apply(
-            lambda x: f'Indonesia-{x}' if x != 'Unknown' else 'Unknown'
+
+        sums = [pl.col(col).sum() for col in self.SUM_COLUMNS]
+
+        mapped, unmapped = pl.collect_all([
+            kqi.filter(pl.col('tower_id').is_not_null())
+            .group_by(self.GROUPBY_MAPPED).agg(sums)
+            .sort(self.GROUPBY_MAPPED, nulls_last=True),
+            kqi.filter(pl.col('tower_id').is_null())
+            .group_by(self.GROUPBY_UNMAPPED).agg(sums)
+            .sort(self.GROUPBY_UNMAPPED, nulls_last=True),
+        ])
+
+        return (
+            mapped.to_pandas() if mapped.height else pd.DataFrame(),
+            unmapped.to_pandas() if unmapped.height else pd.DataFrame()
         )
-        
-        result = result.rename(columns={
-            'operator': 'Opr',
-            'enodeb_id': 'eNodeBID',
-            'plmn': 'PLMN',
-            'tcp_rtt': 'TCP Connect Delay(ms)',
-            'tcp_rtt_good_count': 'TCP Connect RTT Count(times)',
-            'tcp_rtt_step1': 'TCP Connect Step1 Delay(ms)',
-            'tcp_rtt_step1_good_count': 'TCP Connect RTT Step1 Count(times)',
-            'server_probe_ul_lost_pkt': 'Server Side Uplink TCP Packet Losses(Packets)',
-            'tcp_ul_packages_withpl': 'TCP Uplink Packets (with Payload)(Packets)',
-            'server_probe_dw_lost_pkt': 'Server Side Downlink TCP Packet Losses',
-            'tcp_dl_packages_withpl': 'TCP Downlink Packets (with Payload)(Packets)',
-            'user_probe_ul_lost_pkt': 'Client Side Uplink TCP Packet Losses(Packets)',
-            'user_probe_dw_lost_pkt': 'Client Side Downlink TCP Packet Losses(Packets)'
-        })
-        
-        output_cols = [
-            'Opr', 'Date', 'NATIONAL', 'PLMN', 'eNodeBID',
-            'E2E Delay(ms)',
-            'TCP Connect Delay(ms)',
-            'TCP Connect RTT Count(times)',
-            'SYN-SYN ACK Delay(ms)',
-            'TCP Connect Step1 Delay(ms)',
-            'TCP Connect RTT Step1 Count(times)',
-            'SYN ACK-ACK Delay(ms)',
-            'Server Side Uplink TCP Packet Loss Rate(%)',
-            'Server Side Uplink TCP Packet Losses(Packets)',
-            'TCP Uplink Packets (with Payload)(Packets)',
-            'Server Side Downlink TCP Packet Loss Rate(%)',
-            'Server Side Downlink TCP Packet Losses',
-            'TCP Downlink Packets (with Payload)(Packets)',
-            'Client Side Uplink TCP Packet Loss Rate(%)',
-            'Client Side Uplink TCP Packet Losses(Packets)',
-            'Client Side Downlink TCP Packet Loss Rate(%)',
-            'Client Side Downlink TCP Packet Losses(Packets)'
-        ]
-        
-        result['E2E Delay(ms)'] = result['E2E Delay(ms)'].round(0).astype(int)
-        result['SYN-SYN ACK Delay(ms)'] = result['SYN-SYN ACK Delay(ms)'].round(0).astype(int)
-        result['SYN ACK-ACK Delay(ms)'] = result['SYN ACK-ACK Delay(ms)'].round(0).astype(int)
-        
-        loss_rate_cols = [col for col in output_cols if '(%)' in col]
-        for col in loss_rate_cols:
-            if col in result.columns:
-                result[col] = result[col].round(2)
-        
-        return result[output_cols]
\ No newline at end of file
+
+    def _build_tower_lookup(self, sourceraw: pd.DataFrame) -> "pl.DataFrame":
+        """Tabel tower unik per eNodeB ID untuk join Polars"""
+        return (
+            pl.from_pandas(sourceraw[['enodeb_id', 'tower_id', 'swe_l5']])
+            .unique('enodeb_id', keep='first', maintain_order=True)
+        )
\ No newline at end of file
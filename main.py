@@ -1,9 +1,12 @@
 import sys
 import os
+import multiprocessing
 
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
 from presentation.gui import main
 
 if __name__ == "__main__":
+    # Wajib untuk ProcessPoolExecutor di build PyInstaller (Windows)
+    multiprocessing.freeze_support()
     main()
\ No newline at end of file
@@ -1,33 +1,66 @@
+import queue
 import threading
 import tkinter as tk
 from tkinter import filedialog, messagebox, ttk
 import os
 from PIL import Image, ImageTk
 import base64
+import functools
 import io
 from core.use_cases import ProcessKQIDataUseCase
-from infrastructure.file_operations import FileRepository, DataRepository, KQIProcessor
+from infrastructure.file_operations import FileRepository, DataRepository, KQIProcessor, PolarsKQIProcessor
 
 ICON_BASE64 = """
 AAABAAEAIBEAAAEAIADsCAAAFgAAACgAAAAgAAAAIgAAAAEAIAAAAAAAgAgAACUWAAAlFgAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAR8W6AEjGuw9DwrtlQ8K7dEfEvh5BwLoAZ9vSAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAADu7twA7u7cDO7y3DC2ysQFFw7sOQL+5kj6+uPk+vrj/QMC6pk3JwQlKx8AAAAAAAAAAAAAAAAAA035vALuNhB+9jII2vo2CKL2PhAK8joQAAAAAAL6KhgC+ioYGvoqELb6MgzS/jIM3wI6IH9BaKwA9trQAR8a/DETDuzRBwbtUQcC8Vj6+uHE7vLenP8C5KEDAuJE+vbj7Pb24/z29uP8/v7rcXb23IsKJgS69i4M5u46FGbuKggC+gmoAu4mAjbuIfve7iH+4vIqCC7uKggC+jIUAv42HCLuIgXe7iH7pu4h+9LyJgcjAjYg1B+zhA0HBu01Av7m6P7657z29uP49vbj/Pb24/j29uPFBwLnBPr24+D29uP89vbj/Pb24/z+/u5yhlpAgu4iAl7uIf6O6i4FfuYd9AKyFbwC8h3+Wuod9/7uHfsS8iYELuoqEALqLigy7iYGGuod+97qHff+7iIDLvYqFNjTVyARBwLp1Pr658D29uP8+vrj2P7652z++utc+vrnuPr24/j69uP8+vbj/Pb24/z29uP9AvrqvPcXCGb6Gfhm5iYA5vIl+EbyLgUa6gXIArIRwALyHgJa6h33/u4d+w7uJgQq7i4gPu4iBk7qHfvq6h33/u4h/vLyJhChrpZ4AQcG5Wj6+uPM9vbj/QMC5vUTCu2FFwr1SSMTBI0TBuzRBwLiSP7648z69uP89vbj/P766r0bCvhmFoZoAuYmBG7qIfo66h32Qu4qAX7mFegCrhnEAvIeAlbqHff+6h37Cu4mDIbuIgJ66h378uod9/rqIga66ioUeeaegAEPDuxc/vrnLPb24/0C/ubNJxr0aQMC7hD++uexFwr1mUsq/BU3NvwRBwblzPr24+D69ufs+v7mHO7y3MM+AdwC5iYAbuoh+3LqHff+6iYB3uoZ7AKyIbwC8h3+Vuod9/7uHfte6h3+0uod9/bqHffy6h3+cuouEFriHgABAv7gAQcC5UD6+uPo+vrnrQ8K7N17p4gFCwbyLQcG7v0DBudJBwbmgR8S8DUDDuQs/v7i0Pb24/zy8t/w7vLeUAP//ALmIgBu5h37cuod9/7qJf3a5hnsAsIlxALyHf5W6h33/uod9/rqHff+6h374uoh/jbqIgw66iYMASMfAADu6tgA/v7p/Pb24/0C/urxPyMQIQMK7Hj+/udc/uL3HOqHD2z22u+lDw7pYLbSzAEG/um89vbj/PL246jy9uD9ypqAAuImBG7mHfty6h33/uol/drmGfACwh3MAvId/lbqHff+6h33/uod9/7uIgK66iocMuoqEAAAAAABLycIAL6yrAD+/upI9vbj/QcC7q7r//wFCwrofQMC50TBi19MkH+zxL2rV3UDCurBHx70LQr+8Wj69uf8/vrrXRMS9F4SknAC4iIEbuod+3LqHff+6iYB1uoZ8AK+HcwC8h3+Vuod9/7qHffu6h379uod+57mIgFWhkpsBtIqFAEnHwAA8u7cAQL+6fT29uP8/v7q/TsnCCEHAujxAwLnmLlva0SMd7fRXTcbFqJSJqr6Lg0A+wLxwPb25/z++uslJxr8Pkp6WALmJgRu6h37cuod9/7qJf3a5hnsAq4ZzALyIf5W6h33/u4d+z7yIgKO7h37+uod+57mHgVSoprgAtYuHAD+/uABAwLhMPr64+T6+ue5Ewbw9QcO8ET/Bu4BToLhwkHCdwbOEhuK8h362n5mQNz2/ubk9vbj/Qb+6mnjt1QGvjoYAuYmBG7mHfty6h33/uol/drmGewCuh3IAvId/lbqHff+7iH7DvYqBHryHfqW6h33/uod+5rmJg06/b2AASL61AD/CuBQ+vrjFPb24/z+/ubtFw7sflJqNAL+Jf3S+iX7VwImAapCclxA9wLt6Pb64+j6+ufNDwbtIQMC6ALmJgQC5iYEbuoh+ybqHfeW6iYBvuoZ8ALCHcwC8h3+Vuod9/7uIfsW9jIELvYaAGbuGfrS6h33/uoh+4buJgkm8d2YAQbi1AD+/uVA+vbjuPb24/z++ucdEv7ldl5qUfY+fmVBdtrBSP7+5nD29uPY9vbj/QL+7lUzIvwdIxb0AuYmCALmJghy6iIBRu4h9J7yLgUW6gnQAr4hzALyHf5W6h33/u4h+xb2Kggy7iIEAu4iBIrqIfsG6h33/u4d/4bqJgkmZkYwAPcK/Az6+umY+vrnpPb24/z69uPs+vrnlPb653j2+ufM9vbj/Pb24+j6+uqBBwL0WP7+8AGDPzQC5iYIAuYiCHLmIf2q6h35OvIqBTrqDeQC3hnAAu4d/gbuHfuW8h3+rvYqCCr2KggC7iIEAvImBLbqHfr+7h3/iu4iAvLuKhCmwjogAPMG8Aj/BuT8+v7moPr645D6+ufc+vbn6Pr647z6/ucU/wLpmP8K9DT/BuwBX1d8AAAAAALmIgQC5iIEYuod/u7qHftu6iYBluYZ8AMOIdQC7iH8Uvoh+JL+GgBu+h4MBvoeCALqJgQCuj4MAvod/Fr+GgCS+h38lvIqDEMKHgABrv7QARMC5AELEuwhBwrotQcG9UELAvVVCwbs9Q8W9E0T9vgBGz74AAAAAAAAAAAAAAAAAuYiAALmIgAS8h4AfvIh/JbuLgBC7iH0A///+H///4A+HBgABhgAAAYQAAAGAEAAhgCAAIYBgACGA4AQhgeAAIYDgACGA4AAhgGCAYYAwAGGEEADhhggB4YcOB+E=
 """
 
+# Decode icon sekali per process (PhotoImage butuh Tk root, dibuat di _get_icon_photoimage)
+try:
+    _ICON_IMAGE = Image.open(io.BytesIO(base64.b64decode(ICON_BASE64)))
+    _ICON_IMAGE.load()
+except Exception as e:
+    _ICON_IMAGE = None
+    print(f"Icon decode failed: {e}")
+
+
+@functools.lru_cache(maxsize=1)
+def _get_icon_photoimage(root: tk.Tk) -> ImageTk.PhotoImage:
+    """PhotoImage icon, dipakai ulang untuk root yang sama"""
+    return ImageTk.PhotoImage(_ICON_IMAGE, master=root)
+
+
+@functools.lru_cache(maxsize=32)
+def _exists(path: str) -> bool:
+    """os.path.exists yang di-memoize; cache di-clear saat path berubah atau tidak valid"""
+    return os.path.exists(path)
+
+
+@functools.lru_cache(maxsize=1)
+def _get_use_case() -> ProcessKQIDataUseCase:
+    """Repository, processor, dan use case dibuat sekali per process"""
+    file_repo = FileRepository()
+    data_repo = DataRepository()
+    processor = PolarsKQIProcessor() if PolarsKQIProcessor.is_available() else KQIProcessor()
+    return ProcessKQIDataUseCase(file_repo, data_repo, processor)
+
+
 class ModernKQIGUI:
     """Modern GUI untuk KQI-Maakmaay Application"""
+    # Baris log maksimal di text widget; baris lama dibuang
+    MAX_LOG_LINES = 5000
     
     def __init__(self, root: tk.Tk):
         self.root = root
         self.root.title("KQI-Maakmaay")
         self.root.geometry("800x1000")
         
-        try:
-            image_data = base64.b64decode(ICON_BASE64)
-            image = Image.open(io.BytesIO(image_data))
-            icon_image = ImageTk.PhotoImage(image)
-            self.root.iconphoto(False, icon_image)
-            self._icon_ref = icon_image
-        except Exception as e:
-            print(f"Icon load failed: {e}")
+        if _ICON_IMAGE is not None:
+            try:
+                icon_image = _get_icon_photoimage(self.root)
+                self.root.iconphoto(False, icon_image)
+                self._icon_ref = icon_image
+            except Exception as e:
+                print(f"Icon load failed: {e}")
         
         self.bg_color = "#f0f0f0"
         self.primary_color = "#2196F3"
@@ -39,14 +72,16 @@ class ModernKQIGUI:
         self.input_folder = tk.StringVar()
         self.mapping_file = tk.StringVar()
         self.output_folder = tk.StringVar()
+        for variable in (self.input_folder, self.mapping_file, self.output_folder):
+            variable.trace_add("write", lambda *_: _exists.cache_clear())
         self.is_processing = False
+        self._log_queue = queue.Queue()
+        self._pending_progress = None
+        self._refresh_scheduled = threading.Event()
         
         self._create_widgets()
         
-        file_repo = FileRepository()
-        data_repo = DataRepository()
-        processor = KQIProcessor()
-        self.use_case = ProcessKQIDataUseCase(file_repo, data_repo, processor)
+        self.use_case = _get_use_case()
         self.use_case.set_log_callback(self.log_message)
         self.use_case.set_progress_callback(self.update_progress)
 
@@ -226,23 +261,50 @@ class ModernKQIGUI:
             self.output_folder.set(folder)
 
     def log_message(self, message: str):
-        """Log message to text widget - THREAD SAFE"""
-        def update_log():
-            self.log_text.insert(tk.END, message + "\n")
+        """Queue log message untuk text widget - THREAD SAFE"""
+        self._log_queue.put(message)
+        self._request_refresh()
+
+    def _request_refresh(self):
+        """Jadwalkan satu _refresh_ui dalam 50ms, hanya bila ada data baru dan belum terjadwal"""
+        if not self._refresh_scheduled.is_set():
+            self._refresh_scheduled.set()
+            self.root.after(50, self._refresh_ui)
+
+    def _refresh_ui(self):
+        """Apply log dan progress yang tertunda ke widget (di Tk thread)"""
+        self._refresh_scheduled.clear()
+        self._drain_log()
+        self._flush_progress()
+
+    def _drain_log(self):
+        """Insert semua log yang antri dalam satu Text.insert"""
+        lines = []
+        while True:
+            try:
+                lines.append(self._log_queue.get_nowait())
+            except queue.Empty:
+                break
+        
+        if lines:
+            self.log_text.insert(tk.END, "\n".join(lines) + "\n")
+            total = int(self.log_text.index("end-1c").split(".")[0])
+            if total > self.MAX_LOG_LINES:
+                self.log_text.delete("1.0", f"{total - self.MAX_LOG_LINES}.0")
             self.log_text.see(tk.END)
-            self.root.update_idletasks()
-        
-        self.root.after(0, update_log)
 
     def update_progress(self, step: int, total_steps: int, message: str = ""):
-        """Update progress bar and label - THREAD SAFE"""
-        def update_ui():
-            progress_percent = (step / total_steps) * 100
-            self.progress['value'] = progress_percent
+        """Simpan progress terbaru; widget di-update oleh _flush_progress - THREAD SAFE"""
+        self._pending_progress = (step, total_steps, message)
+        self._request_refresh()
+
+    def _flush_progress(self):
+        """Apply progress terbaru (bila ada) ke progress bar dan label"""
+        pending, self._pending_progress = self._pending_progress, None
+        if pending is not None:
+            step, total_steps, message = pending
+            self.progress['value'] = (step / total_steps) * 100
             self.progress_label.config(text=f"Step {step}/{total_steps}: {message}")
-            self.root.update_idletasks()
-        
-        self.root.after(0, update_ui)
 
     def validate_inputs(self) -> bool:
         """Validate input fields"""
@@ -258,11 +320,13 @@ class ModernKQIGUI:
             messagebox.showerror("Error", "Please select output folder!")
             return False
         
-        if not os.path.exists(self.input_folder.get()):
+        if not _exists(self.input_folder.get()):
+            _exists.cache_clear()
             messagebox.showerror("Error", "Input folder does not exist!")
             return False
         
-        if not os.path.exists(self.mapping_file.get()):
+        if not _exists(self.mapping_file.get()):
+            _exists.cache_clear()
             messagebox.showerror("Error", "Mapping file does not exist!")
             return False
         
@@ -278,6 +342,7 @@ class ModernKQIGUI:
             return
         
         # Clear log dan reset UI
+        self._pending_progress = None
         self.log_text.delete(1.0, tk.END)
         self.progress['value'] = 0
         self.progress_label.config(text="Starting processing...")
@@ -286,21 +351,9 @@ class ModernKQIGUI:
         self.is_processing = True
         self.process_btn.config(state=tk.DISABLED, text="Processing...", bg="#cccccc")
         
-        # Enable periodic update check
-        self._start_progress_monitor()
-        
-        # Run in thread
+        # Run in thread, dimulai setelah UI di atas selesai di-render
         thread = threading.Thread(target=self.run_processing, daemon=True)
-        thread.start()
-
-    def _start_progress_monitor(self):
-        """Start periodic UI update to prevent freezing"""
-        def monitor():
-            if self.is_processing:
-                self.root.update_idletasks()
-                self.root.after(100, monitor)  # Update setiap 100ms
-        
-        self.root.after(100, monitor)
+        self.root.after_idle(thread.start)
 
     def run_processing(self):
         """Run processing in background"""
@@ -321,6 +374,7 @@ class ModernKQIGUI:
     def on_processing_complete(self, result):
         """Handle processing completion"""
         self.is_processing = False
+        self._pending_progress = None
         self.progress['value'] = 100
         self.progress_label.config(text="Processing completed successfully!")
         self.process_btn.config(state=tk.NORMAL, text="Start Processing", bg=self.secondary_color)
@@ -336,6 +390,7 @@ class ModernKQIGUI:
     def on_processing_error(self, error_msg: str):
         """Handle processing error"""
         self.is_processing = False
+        self._pending_progress = None
         self.progress['value'] = 0
         self.progress_label.config(text="Processing failed!")
         self.process_btn.config(state=tk.NORMAL, text="Start Processing", bg=self.secondary_color)
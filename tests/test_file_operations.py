@@ -0,0 +1,181 @@
+import gzip
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import infrastructure.file_operations as file_operations
+from core.entities import NetworkIdentifier
+from infrastructure.file_operations import (
+    DataRepository, KQIProcessor, PolarsKQIProcessor, OPERATOR_NAMES,
+    decode_hex_columns, decode_operator_codes
+)
+
+
+class _SmallBlockCsv:
+    """pyarrow.csv dengan block_size kecil supaya open_csv membaca banyak block"""
+
+    def __init__(self, pa_csv):
+        self._pa_csv = pa_csv
+
+    def __getattr__(self, name):
+        return getattr(self._pa_csv, name)
+
+    def ReadOptions(self, **kwargs):
+        kwargs['block_size'] = 4096
+        return self._pa_csv.ReadOptions(**kwargs)
+
+
+def _write_rows(path, rows):
+    with gzip.open(path, 'wt') as fh:
+        fh.write('\n'.join('|'.join(row) for row in rows) + '\n')
+
+
+def test_iter_csv_batches_handles_type_change_mid_file(tmp_path, monkeypatch):
+    pa_csv = pytest.importorskip("pyarrow.csv")
+    # Block pertama: tcp_rtt integer, tcp_rtt_step1 kosong, timecolumn integer;
+    # setelah itu tcp_rtt pecahan, tcp_rtt_step1 terisi, timecolumn notasi E
+    rows = []
+    for i in range(2000):
+        late = i >= 1000
+        row = [str(i % 7 + 1)] * 23
+        row[0] = '2.02510012145E+11' if late else '202510012145'
+        row[2] = '510890597FBC'
+        row[4] = f'{i}.5' if late else str(i)
+        row[21] = str(i) if late else ''
+        rows.append(row)
+    csv_file = tmp_path / 'part0.csv.gz'
+    _write_rows(csv_file, rows)
+
+    repo = DataRepository()
+    expected = pd.concat(
+        list(repo.iter_csv_batches(str(csv_file), '|', KQIProcessor.INPUT_COLUMNS)),
+        ignore_index=True)
+
+    monkeypatch.setattr(file_operations, 'pa_csv', _SmallBlockCsv(pa_csv))
+    batches = list(repo.iter_csv_batches(str(csv_file), '|', KQIProcessor.INPUT_COLUMNS))
+
+    assert len(batches) > 1
+    result = pd.concat(batches, ignore_index=True)
+    pd.testing.assert_frame_equal(result, expected, check_dtype=False)
+    assert result['tcp_rtt'].sum() == sum(range(2000)) + 500
+    assert result['tcp_rtt_step1'].sum() == sum(range(1000, 2000))
+    assert (result['timecolumn'] == 202510012145).all()
+
+
+def test_convert_time_column_builds_date_key():
+    df = pd.DataFrame({'timecolumn': [202510011545, 2.02510021145E+11, 202510011545]})
+    result = KQIProcessor()._convert_time_column(df)
+    assert result['Date'].tolist() == [20251001, 20251002, 20251001]
+
+
+@pytest.mark.parametrize('timestamp', [
+    202510012559,  # jam 25
+    202510011599,  # menit 99
+    202513011545,  # bulan 13
+])
+def test_convert_time_column_rejects_invalid_timestamp(timestamp):
+    df = pd.DataFrame({'timecolumn': [202510011545, timestamp]})
+    with pytest.raises(ValueError):
+        KQIProcessor()._convert_time_column(df)
+
+
+def _kqi_chunk(rows):
+    """Chunk raw KQI seperti output iter_csv_batches (kolom INPUT_COLUMNS)"""
+    df = pd.DataFrame(rows, columns=['timecolumn', 'cgisai'])
+    for i, col in enumerate(KQIProcessor.SUM_COLUMNS):
+        df[col] = [(n * 7 + i * 3) % 50 + 1 for n in range(len(df))]
+    return df
+
+
+def _fixture_chunks():
+    # Mapped (eNodeB 0x0597F, 0x48140), unmapped, PLMN unknown, dan dua tanggal
+    return [
+        _kqi_chunk([
+            (202510012145, '510890597FBC'),
+            (202510030945, '510894814009'),
+            (202510012200, '510890597fbc'),
+            (202510030945, '51011ABCDE01'),
+        ]),
+        _kqi_chunk([
+            (2.02510012145E+11, '510890597FB1'),
+            (202510030945, '99999ABCDE01'),
+            (202510012145, '51011ABCDE02'),
+        ]),
+    ]
+
+
+def _fixture_mapping():
+    return pd.DataFrame({
+        'tower_id': ['T11', 'T12', 'T13'],
+        'swe_l5': ['L5_0', 'L5_1', 'L5_2'],
+        'enodeb_id': [0x0597F, 0x48140, 0x0597F],
+    })
+
+
+def test_polars_processor_matches_pandas_processor():
+    pytest.importorskip("polars")
+    if not PolarsKQIProcessor.is_available():
+        pytest.skip("PolarsKQIProcessor needs polars and pyarrow")
+    sourceraw = _fixture_mapping()
+    expected = KQIProcessor().process_chunks(_fixture_chunks(), sourceraw)
+    result = PolarsKQIProcessor().process_chunks(_fixture_chunks(), sourceraw)
+
+    # Dtype group key boleh beda (categorical vs object); file output harus identik
+    for key in ('mapped', 'unmapped'):
+        assert not expected[key].empty
+        assert result[key].to_csv(index=False) == expected[key].to_csv(index=False)
+
+
+@pytest.mark.parametrize('processor_class', [KQIProcessor, PolarsKQIProcessor])
+def test_sum_chunk_rejects_invalid_timestamp(processor_class):
+    if processor_class is PolarsKQIProcessor and not PolarsKQIProcessor.is_available():
+        pytest.skip("PolarsKQIProcessor needs polars and pyarrow")
+    chunk = _kqi_chunk([(202510012145, '510890597FBC'), (202510012599, '510890597FBC')])
+    with pytest.raises(ValueError):
+        processor_class().sum_chunk(chunk, _fixture_mapping())
+
+
+CGISAI_CASES = [
+    '510890597FBC',  # Tri
+    '510890597fbc',  # hex huruf kecil
+    '51011ABCDE01',  # XL
+    '99999ABCDE01',  # PLMN tidak dikenal
+    '51A89ABCDE01',  # PLMN non-numeric
+    '90597FBC',      # pendek, perlu zfill
+    '1',
+]
+
+
+def _chars(values, start, stop):
+    """Matrix karakter uint8 (N, stop - start) dari cgisai yang sudah di-zfill"""
+    raw = ''.join(value.zfill(12)[start:stop] for value in values).encode('ascii')
+    return np.frombuffer(raw, dtype=np.uint8).reshape(len(values), stop - start)
+
+
+def test_decoders_match_network_identifier():
+    expected = [NetworkIdentifier.from_cgisai(value) for value in CGISAI_CASES]
+
+    assert decode_hex_columns(_chars(CGISAI_CASES, 5, 10)).tolist() == [n.enodeb_id for n in expected]
+    assert decode_hex_columns(_chars(CGISAI_CASES, 10, 12)).tolist() == [n.cell_id for n in expected]
+    operators = OPERATOR_NAMES[decode_operator_codes(_chars(CGISAI_CASES, 0, 5))]
+    assert operators.tolist() == [n.operator for n in expected]
+
+
+def test_convert_network_id_matches_network_identifier():
+    expected = [NetworkIdentifier.from_cgisai(value) for value in CGISAI_CASES]
+    df = KQIProcessor()._convert_network_id(pd.DataFrame({'cgisai': CGISAI_CASES}))
+
+    assert df['enodeb_id'].tolist() == [n.enodeb_id for n in expected]
+    assert df['plmn'].astype(str).tolist() == [n.plmn for n in expected]
+    assert OPERATOR_NAMES[df['operator'].to_numpy()].tolist() == [n.operator for n in expected]
+
+
+@pytest.mark.parametrize('cgisai', ['51089059XFBC', '510890597FGC'])
+def test_decode_hex_columns_rejects_invalid_digit(cgisai):
+    with pytest.raises(ValueError):
+        NetworkIdentifier.from_cgisai(cgisai)
+    with pytest.raises(ValueError):
+        decode_hex_columns(_chars([cgisai], 5, 12))
+    with pytest.raises(ValueError):
+        KQIProcessor()._convert_network_id(pd.DataFrame({'cgisai': ['510890597FBC', cgisai]}))